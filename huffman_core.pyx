@@ -0,0 +1,99 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# huffman_core.pyx
+# Optional C-compiled inner loops for huffman_tool.py.
+# Build in place with:  cythonize -i huffman_core.pyx
+# When the extension is not built, huffman_tool.py falls back to its pure-Python loops.
+
+from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t
+from libc.stdlib cimport malloc, free
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
+
+# -----------------------------
+# Encoder: pack the code of every input byte into the output bytes
+# -----------------------------
+def encode(const uint8_t[::1] data, const uint32_t[::1] code_val, const uint8_t[::1] code_len,
+           uint64_t acc=0, int nbits=0):
+    """
+    Pack the Huffman codes of the data into bytes. 'acc' and 'nbits' carry the
+    unflushed bits (fewer than 8) between chunks, exactly like encode_to_bytes
+    in huffman_tool.py. Codes must be at most 32 bits long (MAX_CODE_LENGTH in
+    huffman_tool.py is 12), so they fit the 64-bit accumulator. Returns
+    (bytes, acc, nbits).
+    """
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t i
+    cdef Py_ssize_t o = 0
+    cdef Py_ssize_t total_bits = nbits
+    cdef uint8_t byte, length
+    cdef uint8_t* p
+
+    # Size the output exactly first, so it can be written in place.
+    for i in range(n):
+        total_bits += code_len[data[i]]
+    out = PyBytes_FromStringAndSize(NULL, total_bits >> 3)
+    p = <uint8_t*> PyBytes_AS_STRING(out)
+
+    with nogil:
+        for i in range(n):
+            byte = data[i]
+            length = code_len[byte]
+            acc = (acc << length) | code_val[byte]
+            nbits += length
+            while nbits >= 8:
+                nbits -= 8
+                p[o] = <uint8_t> (acc >> nbits)
+                o += 1
+            acc &= ((<uint64_t> 1) << nbits) - 1   # Keep only the bits not yet flushed
+    return out, acc, nbits
+
+# -----------------------------
+# Decoder: two-level table lookup over a 64-bit bit accumulator
+# -----------------------------
+cdef enum:
+    SUBTABLE_FLAG = 0x8000   # Must match SUBTABLE_FLAG in huffman_tool.py
+
+def decode(const uint8_t[::1] data, const uint16_t[::1] table, int root_bits, int sub_bits,
+           Py_ssize_t nsyms):
+    """
+    Decode 'nsyms' bytes from the data with the two-level table built by
+    build_window_tables in huffman_tool.py. Returns the decoded bytes (fewer
+    than 'nsyms' only if the data is corrupted).
+    """
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t count = 0
+    cdef int window_bits = root_bits + sub_bits
+    cdef uint64_t acc = 0
+    cdef uint64_t mask = ((<uint64_t> 1) << window_bits) - 1
+    cdef uint64_t sub_mask = ((<uint64_t> 1) << sub_bits) - 1
+    cdef uint64_t window
+    cdef uint16_t entry
+    cdef int nbits = 0
+    cdef int length
+    cdef uint8_t* out = <uint8_t*> malloc(nsyms if nsyms > 0 else 1)
+    if out == NULL:
+        raise MemoryError()
+
+    try:
+        with nogil:
+            while count < nsyms:
+                while nbits <= 56 and i < n:
+                    acc = (acc << 8) | data[i]
+                    nbits += 8
+                    i += 1
+                if nbits >= window_bits:
+                    window = (acc >> (nbits - window_bits)) & mask
+                else:
+                    window = (acc << (window_bits - nbits)) & mask   # Near the end: pad with zeros
+                entry = table[window >> sub_bits]
+                if entry & SUBTABLE_FLAG:
+                    entry = table[(1 << root_bits) + ((entry & ~SUBTABLE_FLAG) << sub_bits) + (window & sub_mask)]
+                length = entry & 0xF
+                if length == 0 or length > nbits:
+                    break   # Corrupted input
+                out[count] = <uint8_t> (entry >> 4)
+                count += 1
+                nbits -= length
+        return PyBytes_FromStringAndSize(<char*> out, count)
+    finally:
+        free(out)
@@ -1,208 +1,500 @@
 # huffman_tool.py
 # A desktop application for Huffman encoding/decoding with an attractive Tkinter GUI using ttk.
-# This version includes a fallback for file reading to handle non-UTF-8 encoded text files.
+# Files are processed as raw bytes, so any file (text or binary) can be compressed.
 
 import os
-import heapq                        # For priority queue operations in building the Huffman tree
-from collections import Counter      # To count character frequencies in the text
-import json                         # For serializing header information
-import struct                       # For packing/unpacking binary data (header length)
+import functools                    # For memoizing code lengths and decode tables
+import mmap                         # For reading the input file on demand instead of all at once
+import heapq                        # For merging sorted lists in the package-merge algorithm
+from collections import Counter      # To count byte frequencies in the file
+from concurrent.futures import ProcessPoolExecutor   # For counting large files on all CPUs
+import multiprocessing              # For starting the counting workers without fork
+import struct                       # For packing/unpacking the binary header
+import array                        # Typed code tables for the compiled core
+try:
+    import numpy as np              # Optional: vectorized frequency counting and decoder arrays
+except ImportError:
+    np = None
+try:
+    import numba                    # Optional: JIT-compiles the decoder loop to machine code
+except ImportError:
+    numba = None
+try:
+    import huffman_core             # Optional: Cython-compiled encode/decode loops (huffman_core.pyx)
+except ImportError:
+    huffman_core = None
+import queue                        # For passing events from the worker thread to the GUI
+import threading                    # For running compression off the GUI thread
 import tkinter as tk                # Base Tkinter module
 from tkinter import filedialog, messagebox
 from tkinter import ttk             # Themed widgets for a good UI
 
+CHUNK_SIZE = 1 << 20   # Input is processed and output buffered in 1 MiB chunks
+COUNT_BLOCK_SIZE = 1 << 16       # Frequencies are counted in cache-sized 64 KiB blocks
+PARALLEL_COUNT_SIZE = 32 << 20   # Files this large are counted across worker processes
+MAX_CODE_LENGTH = 12             # Longest Huffman code, so any code decodes in at most two table lookups
+
 # -----------------------------
-# Block 1: Defining the Huffman Tree Node
+# Block 1: Build Frequency Table
 # -----------------------------
-class Node:
-    def __init__(self, char, freq):
-        self.char = char      # The character (or None for internal nodes)
-        self.freq = freq      # Frequency of the character
-        self.left = None      # Left child
-        self.right = None     # Right child
+def build_frequency_table(data, start=0, stop=None):
+    """
+    Count the frequency of each byte value in data[start:stop], one small block
+    at a time so the working set stays in cache. With numpy each block is
+    counted by np.bincount in a single C loop.
+    """
+    if stop is None:
+        stop = len(data)
+    if np is not None:
+        counts = np.zeros(256, dtype=np.int64)
+        for block in range(start, stop, COUNT_BLOCK_SIZE):
+            # The temporary array view is dropped at once, so an mmap can still be closed.
+            size = min(COUNT_BLOCK_SIZE, stop - block)
+            counts += np.bincount(np.frombuffer(data, dtype=np.uint8, count=size, offset=block), minlength=256)
+        return {byte: count for byte, count in enumerate(counts.tolist()) if count}
 
-    # Allow nodes to be compared based on frequency (required for heapq)
-    def __lt__(self, other):
-        return self.freq < other.freq
+    freq_table = Counter()
+    for block in range(start, stop, COUNT_BLOCK_SIZE):
+        freq_table.update(data[block:min(block + COUNT_BLOCK_SIZE, stop)])
+    return freq_table
 
-# -----------------------------
-# Block 2: Build Frequency Table & Huffman Tree
-# -----------------------------
-def build_frequency_table(text):
-    """Count the frequency of each character in the text."""
-    return Counter(text)
-
-def build_huffman_tree(freq_table):
-    """Build the Huffman tree using a min-heap."""
-    heap = [Node(char, freq) for char, freq in freq_table.items()]
-    heapq.heapify(heap)
-    
-    while len(heap) > 1:
-        left = heapq.heappop(heap)
-        right = heapq.heappop(heap)
-        merged = Node(None, left.freq + right.freq)
-        merged.left = left
-        merged.right = right
-        heapq.heappush(heap, merged)
-    
-    return heap[0] if heap else None
+def _count_file_range(input_path, start, stop):
+    """Worker process: map the file and count the bytes in [start, stop)."""
+    with open(input_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return build_frequency_table(data, start, stop)
+
+def count_file_frequencies(input_path, data):
+    """
+    Count the byte frequencies of a mapped input file. Large files counted in
+    pure Python are split across worker processes, one range per CPU, and the
+    partial tables (at most 256 entries each) are summed here.
+    """
+    workers = os.cpu_count() or 1
+    if np is not None or workers < 2 or len(data) < PARALLEL_COUNT_SIZE:
+        return build_frequency_table(data)
+
+    step = -(-len(data) // workers)
+    freq_table = Counter()
+    # Spawn fresh workers: this runs on the GUI's worker thread, and forking a
+    # multi-threaded process that holds Tk state can deadlock the child.
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(_count_file_range, input_path, start, min(start + step, len(data)))
+                   for start in range(0, len(data), step)]
+        for future in futures:
+            freq_table.update(future.result())
+    return freq_table
 
 # -----------------------------
-# Block 3: Generate Huffman Codes
+# Block 2: Length-Limited Huffman Code Lengths
 # -----------------------------
-def generate_codes(node, current_code="", code_table=None):
+def length_limited_huffman(freq_table, max_length=MAX_CODE_LENGTH):
+    """
+    Compute optimal Huffman code lengths no longer than 'max_length' bits.
+    Returns {byte: length}. Results are memoized on the (byte, frequency)
+    pairs, so compressing files with identical statistics reuses them.
     """
-    Recursively traverse the Huffman tree to generate binary codes for each character.
+    return dict(_package_merge(tuple(sorted(freq_table.items())), max_length))
+
+@functools.lru_cache(maxsize=64)
+def _package_merge(freq_items, max_length):
+    """
+    The package-merge algorithm. The leaves (sorted by frequency) are merged
+    max_length - 1 times with pairwise "packages" of the previous list; a byte's
+    code length is the number of the first 2n - 2 items it appears in.
+    Returns a tuple of (byte, length) pairs.
     """
-    if code_table is None:
-        code_table = {}
+    leaves = sorted((freq, [byte]) for byte, freq in freq_items)
+    if len(leaves) == 1:
+        return ((leaves[0][1][0], 1),)   # A single distinct byte still needs a 1-bit code
+
+    items = leaves
+    for _ in range(max_length - 1):
+        packages = [(items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+                    for i in range(0, len(items) - 1, 2)]
+        items = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
 
-    if node is None:
-        return code_table
+    length_table = Counter()
+    for _, symbols in items[:2 * len(leaves) - 2]:
+        length_table.update(symbols)
+    return tuple(length_table.items())
 
-    # If the node is a leaf, assign its code (handle single-node tree)
-    if node.char is not None:
-        code_table[node.char] = current_code or "0"
-        return code_table
+# -----------------------------
+# Block 3: Canonical Huffman Codes
+# -----------------------------
+def get_code_lengths(length_table):
+    """Return a 256-entry list with the code length of each byte value (0 if unused)."""
+    lengths = [0] * 256
+    for byte, length in length_table.items():
+        lengths[byte] = length
+    return lengths
 
-    generate_codes(node.left, current_code + "0", code_table)
-    generate_codes(node.right, current_code + "1", code_table)
+def assign_canonical_codes(lengths):
+    """
+    Assign canonical Huffman codes from the code lengths alone. Bytes are sorted
+    by (length, byte value) and given consecutive codes, shifting left whenever
+    the length grows, so the decoder can rebuild the exact same codes from the
+    lengths stored in the header.
+    """
+    code_table = {}
+    code = 0
+    prev_length = 0
+    for length, byte in sorted((length, byte) for byte, length in enumerate(lengths) if length):
+        code <<= length - prev_length
+        code_table[byte] = (code, length)
+        code += 1
+        prev_length = length
     return code_table
 
+def build_code_list(code_table):
+    """
+    Build a 256-entry list indexed by byte value holding each (value, length)
+    code, so the encoder can index by byte instead of hashing (None for bytes
+    that never occur).
+    """
+    code_list = [None] * 256
+    for byte, code in code_table.items():
+        code_list[byte] = code
+    return code_list
+
 # -----------------------------
-# Block 4: Encode Text & Create Bit Stream
+# Block 4: Encode Data into Bytes
 # -----------------------------
-def encode_text(text, code_table):
-    """Convert the text into a string of bits using the Huffman code table."""
-    return "".join(code_table[char] for char in text)
+FLUSH_BITS = 128   # Bit count at which the encoder converts its buffer to bytes
+
+def flush_bytes(out, buf, nbits):
+    """
+    Append every whole byte held in the bit buffer to 'out' with a single
+    int.to_bytes call. Returns the remaining (buf, nbits), fewer than 8 bits.
+    """
+    extra = nbits & 7
+    out += (buf >> extra).to_bytes(nbits >> 3, "big")
+    return buf & ((1 << extra) - 1), extra
+
+def encode_to_bytes(data, code_list, buf=0, nbits=0):
+    """
+    Pack the Huffman codes of the data straight into a bytearray.
+    Bits are accumulated in an integer buffer and flushed FLUSH_BITS at a time,
+    so the full bit string is never built. 'buf' and 'nbits' carry the
+    unflushed bits (fewer than 8) between chunks; the updated pair is
+    returned with the bytes so the next chunk can continue from it.
+    """
+    out = bytearray()
+    for byte in data:
+        value, length = code_list[byte]
+        buf = (buf << length) | value
+        nbits += length
+        if nbits >= FLUSH_BITS:
+            buf, nbits = flush_bytes(out, buf, nbits)
+    buf, nbits = flush_bytes(out, buf, nbits)
+    return out, buf, nbits
 
-def pad_encoded_text(encoded_text):
+def build_chunk_encoder(code_list):
     """
-    Pad the encoded text with extra zeros so its length is a multiple of 8.
-    Returns the padded text and the number of padding bits added.
+    Return encode(chunk, buf, nbits) -> (bytes, buf, nbits) for the code list,
+    using the compiled huffman_core loop when it is built.
     """
-    extra_padding = 8 - (len(encoded_text) % 8)
-    if extra_padding == 8:
-        extra_padding = 0  # No padding needed if already a multiple of 8
-    padded_encoded_text = encoded_text + "0" * extra_padding
-    return padded_encoded_text, extra_padding
-
-def get_byte_array(padded_encoded_text):
-    """Convert the padded bit string into a bytearray."""
-    b = bytearray()
-    for i in range(0, len(padded_encoded_text), 8):
-        byte = padded_encoded_text[i:i+8]
-        b.append(int(byte, 2))
-    return b
+    if huffman_core is not None:
+        code_val = array.array("I", [code[0] if code else 0 for code in code_list])
+        code_len = bytes(code[1] if code else 0 for code in code_list)
+
+        def encode(chunk, buf, nbits):
+            return huffman_core.encode(chunk, code_val, code_len, buf, nbits)
+        return encode
+
+    def encode(chunk, buf, nbits):
+        return encode_to_bytes(chunk, code_list, buf, nbits)
+    return encode
+
+def finish_bits(buf, nbits):
+    """Pad the leftover bits with zeros to a whole byte and return it (if any)."""
+    if not nbits:
+        return b""
+    return bytes([(buf << (8 - nbits)) & 0xFF])
 
 # -----------------------------
-# Block 5: Compress File (Write Compressed Output)
+# Block 5: Build the Byte-at-a-Time Decode Table
 # -----------------------------
-def compress_file(input_path, output_path):
+def walk_bits(decode_map, state, byte, nbits):
+    """
+    Feed the top 'nbits' bits of 'byte' into the partial code 'state', emitting
+    a byte each time a complete code from 'decode_map' is matched. Returns the
+    decoded bytes and the final state.
+    """
+    symbols = []
+    for shift in range(7, 7 - nbits, -1):
+        state = (state << 1) | ((byte >> shift) & 1)
+        symbol = decode_map.get(state)
+        if symbol is not None:
+            symbols.append(symbol)
+            state = 1
+    return bytes(symbols), state
+
+@functools.lru_cache(maxsize=4)
+def build_decode_table(lengths):
+    """
+    Precompute table[state][byte] -> (decoded bytes, next_state) for the canonical
+    codes of the (tuple of) code lengths. A state is a partially read code with a
+    leading 1 bit marking its length (1 at a code boundary), so the decoder
+    consumes a whole byte per lookup instead of a single bit. Memoized on the
+    lengths, so files sharing a header share the table; only a few are kept,
+    as a full 256-symbol table takes several megabytes.
+    """
+    code_table = assign_canonical_codes(lengths)
+    decode_map = {(1 << length) | code: byte for byte, (code, length) in code_table.items()}
+    states = {key >> k for key in decode_map for k in range(1, key.bit_length())}
+
+    table = {}
+    for state in states:
+        table[state] = [walk_bits(decode_map, state, byte, 8) for byte in range(256)]
+    return table
+
+def decode_with_table(lengths, compressed_data, symbol_count):
+    """
+    Decode the compressed bytes one byte per lookup using the state table.
+    Symbols decoded from the zero padding after the last code are dropped
+    by cutting the output at 'symbol_count'.
+    """
+    table = build_decode_table(lengths)
+
+    decoded_data = bytearray()
+    state = 1
     try:
-        # Try reading with UTF-8; if that fails, fall back to Latin-1.
-        try:
-            with open(input_path, "r", encoding="utf-8") as file:
-                text = file.read()
-        except UnicodeDecodeError:
-            with open(input_path, "r", encoding="latin-1") as file:
-                text = file.read()
-    except Exception as e:
-        messagebox.showerror("Error", f"Could not read file: {e}")
-        return
+        for byte in compressed_data:
+            symbols, state = table[state][byte]
+            decoded_data += symbols
+    except KeyError:
+        # Only a lone 1-bit code leaves states unmapped, and reaching one means the
+        # data is corrupted. The short output is reported by decompress_file.
+        pass
+    del decoded_data[symbol_count:]
+    return decoded_data
 
-    if not text:
-        messagebox.showwarning("Warning", "Input file is empty!")
-        return
+# -----------------------------
+# Block 6: Window Decoder (compiled with huffman_core or numba when available)
+# -----------------------------
+ROOT_BITS = 9            # Codes up to this long resolve in the root table alone
+SUBTABLE_FLAG = 0x8000   # Marks a root entry that points to a subtable
 
-    # Build the frequency table and Huffman tree, then generate codes.
-    freq_table = build_frequency_table(text)
-    huffman_tree = build_huffman_tree(freq_table)
-    code_table = generate_codes(huffman_tree)
-    
-    # Encode the text using the Huffman code table.
-    encoded_text = encode_text(text, code_table)
-    padded_encoded_text, extra_padding = pad_encoded_text(encoded_text)
-    byte_array = get_byte_array(padded_encoded_text)
-    
-    # Creating header information to help during decompression.
-    header = {
-        "freq": dict(freq_table),   # Convert Counter to a dict for JSON serialization.
-        "padding": extra_padding
-    }
-    header_json = json.dumps(header)
-    header_bytes = header_json.encode("utf-8")
-    header_length = len(header_bytes)
-    
+@functools.lru_cache(maxsize=64)
+def build_window_tables(lengths):
+    """
+    Build a two-level lookup table, as one array of 16-bit entries, for the
+    canonical codes of the (tuple of) code lengths. The root table is indexed
+    by the next 'root_bits' bits of input; the subtables that follow it are
+    indexed by the next 'sub_bits' bits and hold the rarer codes longer than
+    'root_bits'. A direct entry is (byte << 4) | code length, and a root entry
+    for a long prefix is SUBTABLE_FLAG | subtable number. Memoized on the
+    lengths like build_decode_table. Returns (table, root_bits, sub_bits).
+    """
+    code_table = assign_canonical_codes(lengths)
+    max_length = max(length for _, length in code_table.values())
+    root_bits = min(ROOT_BITS, max_length)
+    sub_bits = max_length - root_bits
+    table = array.array("H", bytes(2 << root_bits))
+    subtables = {}   # Root prefix -> subtable number
+    for byte, (code, length) in code_table.items():
+        entry = (byte << 4) | length
+        if length <= root_bits:
+            start = code << (root_bits - length)
+            span = 1 << (root_bits - length)
+        else:
+            prefix = code >> (length - root_bits)
+            if prefix not in subtables:
+                subtables[prefix] = len(subtables)
+                table[prefix] = SUBTABLE_FLAG | subtables[prefix]
+                table.extend(bytes(2 << sub_bits))
+            rest = code & ((1 << (length - root_bits)) - 1)
+            start = (1 << root_bits) + (subtables[prefix] << sub_bits) + (rest << (max_length - length))
+            span = 1 << (max_length - length)
+        table[start:start + span] = array.array("H", [entry]) * span
+    return table, root_bits, sub_bits
+
+def _decode_window(data, table, root_bits, sub_bits, out):
+    """
+    Decode one symbol per lookup, peeking root_bits + sub_bits bits at a time
+    from a bit accumulator refilled byte by byte, until 'out' is full. Short
+    codes resolve in the root table; only long ones take a second lookup.
+    Returns the number of bytes written to 'out'.
+    """
+    window_bits = root_bits + sub_bits
+    mask = (1 << window_bits) - 1
+    sub_mask = (1 << sub_bits) - 1
+    acc = 0         # Unconsumed input bits (at most 56)
+    nbits = 0       # Number of valid bits in acc
+    i = 0           # Next input byte to load
+    count = 0
+    while count < out.shape[0]:
+        while nbits <= 48 and i < data.shape[0]:
+            acc = ((acc << 8) | data[i]) & 0xFFFFFFFFFFFFFF
+            nbits += 8
+            i += 1
+        if nbits >= window_bits:
+            window = (acc >> (nbits - window_bits)) & mask
+        else:
+            window = (acc << (window_bits - nbits)) & mask   # Near the end: pad with zeros
+        entry = table[window >> sub_bits]
+        if entry & SUBTABLE_FLAG:
+            entry = table[(1 << root_bits) + ((entry & ~SUBTABLE_FLAG) << sub_bits) + (window & sub_mask)]
+        length = entry & 0xF
+        if length == 0 or length > nbits:
+            break   # Corrupted input
+        out[count] = entry >> 4
+        count += 1
+        nbits -= length
+    return count
+
+if numba is not None:
+    _decode_window = numba.njit(cache=True)(_decode_window)
+
+def decode_with_window(lengths, compressed_data, symbol_count):
+    """Decode 'symbol_count' bytes with the compiled (Cython or numba) window decoder."""
+    table, root_bits, sub_bits = build_window_tables(lengths)
+    if huffman_core is not None:
+        return huffman_core.decode(compressed_data, table, root_bits, sub_bits, symbol_count)
+
+    data = np.frombuffer(compressed_data, dtype=np.uint8)
+    out = np.empty(symbol_count, dtype=np.uint8)
+    count = _decode_window(data, np.frombuffer(table, dtype=np.uint16), root_bits, sub_bits, out)
+    return memoryview(out)[:count]   # Written out directly, without another copy
+
+# -----------------------------
+# Block 7: Compress File (Write Compressed Output)
+# -----------------------------
+HEADER_STRUCT = struct.Struct("<Q256B")   # Original byte count, then the code length of each byte value
+HEADER_SIZE = HEADER_STRUCT.size          # Fixed, so no header length needs to be stored
+
+def compress_file(input_path, output_path, messages=messagebox, progress=None):
+    """
+    Compress input_path into output_path. Results are reported through
+    'messages' (tkinter.messagebox or a stand-in with the same show* methods),
+    and 'progress', if given, is called with the fraction of input encoded.
+    """
     try:
-        with open(output_path, "wb") as output:
-            # Write header length (4 bytes), then the header, then the compressed data.
-            output.write(struct.pack("I", header_length))
-            output.write(header_bytes)
-            output.write(byte_array)
+        file = open(input_path, "rb")
     except Exception as e:
-        messagebox.showerror("Error", f"Could not write output file: {e}")
+        messages.showerror("Error", f"Could not read file: {e}")
         return
 
-    messagebox.showinfo("Success", "File compressed successfully!")
+    with file:
+        input_stat = os.fstat(file.fileno())
+        if input_stat.st_size == 0:
+            messages.showwarning("Warning", "Input file is empty!")
+            return
+
+        # The input is mapped while the output is written, so truncating it by writing
+        # over it would crash the process (SIGBUS) instead of raising an exception.
+        if os.path.exists(output_path) and os.path.samestat(input_stat, os.stat(output_path)):
+            messages.showerror("Error", "The output file must be different from the input file.")
+            return
+
+        # Map the file instead of reading it, so the OS pages it in on demand.
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception as e:
+            messages.showerror("Error", f"Could not read file: {e}")
+            return
+
+        with data:
+            # Build the frequency table and length-limited code lengths, then derive
+            # canonical codes from them so the header only needs to store the lengths.
+            freq_table = count_file_frequencies(input_path, data)
+            lengths = get_code_lengths(length_limited_huffman(freq_table))
+            code_list = build_code_list(assign_canonical_codes(lengths))
+
+            try:
+                with open(output_path, "wb", buffering=CHUNK_SIZE) as output:
+                    # Write the fixed-size header: the original byte count and one
+                    # code length per byte value.
+                    output.write(HEADER_STRUCT.pack(len(data), *lengths))
+
+                    # Encode the data chunk by chunk, carrying the unflushed bits over.
+                    encode_chunk = build_chunk_encoder(code_list)
+                    buf = nbits = 0
+                    for start in range(0, len(data), CHUNK_SIZE):
+                        byte_array, buf, nbits = encode_chunk(data[start:start + CHUNK_SIZE], buf, nbits)
+                        output.write(byte_array)
+                        if progress is not None:
+                            progress(min(start + CHUNK_SIZE, len(data)) / len(data))
+                    output.write(finish_bits(buf, nbits))
+            except Exception as e:
+                messages.showerror("Error", f"Could not write output file: {e}")
+                return
+
+    messages.showinfo("Success", "File compressed successfully!")
 
 # -----------------------------
-# Block 6: Decompress File (Read and Decode)
+# Block 8: Decompress File (Read and Decode)
 # -----------------------------
-def decompress_file(input_path, output_path):
+def decompress_file(input_path, output_path, messages=messagebox):
+    """Decompress input_path into output_path, reporting results through 'messages'."""
     try:
         with open(input_path, "rb") as file:
-            header_length_bytes = file.read(4)
-            if len(header_length_bytes) < 4:
+            header_bytes = file.read(HEADER_SIZE)
+            if len(header_bytes) < HEADER_SIZE:
+                raise Exception("Invalid file format or corrupted file.")
+            header = HEADER_STRUCT.unpack(header_bytes)
+            symbol_count, lengths = header[0], header[1:]
+            if max(lengths) > MAX_CODE_LENGTH:
+                raise Exception("Invalid file format or corrupted file.")
+            # The lengths must describe a complete prefix code (Kraft sum exactly 1),
+            # except for a lone 1-bit code, which is how single-byte files are stored.
+            used = [length for length in lengths if length]
+            kraft_sum = sum(1 << (MAX_CODE_LENGTH - length) for length in used)
+            if not used or (kraft_sum != 1 << MAX_CODE_LENGTH and used != [1]):
                 raise Exception("Invalid file format or corrupted file.")
-            header_length = struct.unpack("I", header_length_bytes)[0]
-            
-            header_bytes = file.read(header_length)
-            header_json = header_bytes.decode("utf-8")
-            header = json.loads(header_json)
-            freq_table = header["freq"]
-            extra_padding = header["padding"]
             
             compressed_data = file.read()
     except Exception as e:
-        messagebox.showerror("Error", f"Could not read compressed file: {e}")
+        messages.showerror("Error", f"Could not read compressed file: {e}")
         return
 
     if not compressed_data:
-        messagebox.showwarning("Warning", "Compressed file is empty!")
+        messages.showwarning("Warning", "Compressed file is empty!")
         return
 
-    # Rebuild the Huffman tree from the stored frequency table.
-    huffman_tree = build_huffman_tree(freq_table)
-    
-    # Convert the compressed byte data back into a bit string.
-    bit_string = "".join(bin(byte)[2:].rjust(8, '0') for byte in compressed_data)
-    
-    # Remove the extra padding bits added during compression.
-    if extra_padding > 0:
-        bit_string = bit_string[:-extra_padding]
-    
-    # Decode the bit string using the Huffman tree.
-    decoded_text = ""
-    current_node = huffman_tree
-    for bit in bit_string:
-        current_node = current_node.left if bit == "0" else current_node.right
-        if current_node.char is not None:
-            decoded_text += current_node.char
-            current_node = huffman_tree
+    # Every code is at least one bit long, so a larger count is corrupted. Checked
+    # before decoding, since the decoders allocate 'symbol_count' bytes up front.
+    if symbol_count > 8 * len(compressed_data):
+        messages.showerror("Error", "Could not decompress file: the compressed data is corrupted.")
+        return
+
+    # Decode with tables rebuilt from the canonical codes of the stored lengths. Use a
+    # compiled window decoder when available, else the byte-at-a-time table.
+    if huffman_core is not None or numba is not None:
+        decoded_data = decode_with_window(lengths, compressed_data, symbol_count)
+    else:
+        decoded_data = decode_with_table(lengths, compressed_data, symbol_count)
+
+    if len(decoded_data) != symbol_count:
+        messages.showerror("Error", "Could not decompress file: the compressed data is corrupted.")
+        return
 
     try:
-        with open(output_path, "w", encoding="utf-8") as output:
-            output.write(decoded_text)
+        with open(output_path, "wb") as output:
+            output.write(decoded_data)
     except Exception as e:
-        messagebox.showerror("Error", f"Could not write decompressed file: {e}")
+        messages.showerror("Error", f"Could not write decompressed file: {e}")
         return
 
-    messagebox.showinfo("Success", "File decompressed successfully!")
+    messages.showinfo("Success", "File decompressed successfully!")
 
 # -----------------------------
-# Block 7: Building the Desktop GUI
+# Block 9: Building the Desktop GUI
 # -----------------------------
+class QueuedMessages:
+    """Stand-in for tkinter.messagebox that queues dialogs for the GUI thread to show."""
+    def __init__(self, events):
+        self.events = events
+
+    def showinfo(self, title, message):
+        self.events.put(("showinfo", title, message))
+
+    def showwarning(self, title, message):
+        self.events.put(("showwarning", title, message))
+
+    def showerror(self, title, message):
+        self.events.put(("showerror", title, message))
+
 def create_gui():
     root = tk.Tk()
     root.title("Huffman Compression Tool")
@@ -226,6 +518,44 @@ def create_gui():
     status_label = ttk.Label(root, text="Welcome! Please choose an action.", relief="sunken", anchor="w", padding=5)
     status_label.grid(row=2, column=0, sticky="ew", padx=10, pady=(0,10))
     
+    # Work runs on a background thread so the window stays responsive. The worker never
+    # touches Tk itself: it posts events to this queue, which the main loop drains.
+    events = queue.Queue()
+    messages = QueuedMessages(events)
+
+    def poll_events():
+        while True:
+            try:
+                kind, *args = events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                status_label.config(text=f"{args[0]} {args[1]:.0%}")
+            elif kind == "done":
+                status_label.config(text=args[0])
+                compress_btn.state(["!disabled"])
+                decompress_btn.state(["!disabled"])
+            else:
+                getattr(messagebox, kind)(*args)   # showinfo / showwarning / showerror
+        root.after(100, poll_events)
+
+    def run_in_background(work, status_text, done_text, failed_text):
+        status_label.config(text=status_text)
+        compress_btn.state(["disabled"])
+        decompress_btn.state(["disabled"])
+
+        def run():
+            # An exception would otherwise end the thread silently, with only a
+            # traceback on stderr, so report it and post the failure status instead.
+            try:
+                work()
+            except Exception as e:
+                events.put(("showerror", "Error", f"Unexpected error: {e}"))
+                events.put(("done", failed_text))
+            else:
+                events.put(("done", done_text))
+        threading.Thread(target=run, daemon=True).start()
+
     # Define actions as inner functions so they have access to 'root' and 'status_label'.
     def compress_action():
         input_path = filedialog.askopenfilename(
@@ -241,10 +571,11 @@ def create_gui():
         )
         if not output_path:
             return
-        status_label.config(text="Compressing file...")
-        root.update_idletasks()
-        compress_file(input_path, output_path)
-        status_label.config(text="Compression finished.")
+
+        def report_progress(fraction):
+            events.put(("progress", "Compressing file...", fraction))
+        run_in_background(lambda: compress_file(input_path, output_path, messages, report_progress),
+                          "Compressing file...", "Compression finished.", "Compression failed.")
     
     def decompress_action():
         input_path = filedialog.askopenfilename(
@@ -260,10 +591,8 @@ def create_gui():
         )
         if not output_path:
             return
-        status_label.config(text="Decompressing file...")
-        root.update_idletasks()
-        decompress_file(input_path, output_path)
-        status_label.config(text="Decompression finished.")
+        run_in_background(lambda: decompress_file(input_path, output_path, messages),
+                          "Decompressing file...", "Decompression finished.", "Decompression failed.")
     
     # Create attractive, well-spaced buttons using ttk.
     compress_btn = ttk.Button(button_frame, text="Compress File", command=compress_action)
@@ -277,6 +606,7 @@ def create_gui():
     button_frame.columnconfigure(0, weight=1)
     button_frame.columnconfigure(1, weight=1)
     
+    poll_events()
     root.mainloop()
 
 if __name__ == "__main__":